@@ -0,0 +1,40 @@
+import os
+from dotenv import load_dotenv
+import boto3
+from botocore.config import Config
+
+# Load environment variables
+load_dotenv()
+
+# AWS Bedrock configuration
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+# Client settings shared by every Bedrock client: a connection pool sized for
+# concurrent report generation, kept-alive sockets, and adaptive retries so
+# throttled calls back off together instead of hammering the endpoint.
+BEDROCK_CLIENT_OPTIONS = {
+    "max_pool_connections": 32,
+    "retries": {"max_attempts": 5, "mode": "adaptive"},
+    "tcp_keepalive": True,
+    "read_timeout": 60,
+    "connect_timeout": 5,
+}
+
+def has_aws_credentials() -> bool:
+    """Return True if AWS credentials are set in the environment."""
+    return bool(AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY)
+
+def bedrock_client_kwargs() -> dict:
+    """Keyword arguments for creating a bedrock-runtime client, excluding config."""
+    return {
+        "service_name": "bedrock-runtime",
+        "region_name": AWS_REGION,
+        "aws_access_key_id": AWS_ACCESS_KEY_ID,
+        "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
+    }
+
+def create_bedrock_client():
+    """Create a synchronous boto3 Bedrock client with the shared settings."""
+    return boto3.client(**bedrock_client_kwargs(), config=Config(**BEDROCK_CLIENT_OPTIONS))
@@ -1,38 +1,25 @@
-import os
-from dotenv import load_dotenv
-import boto3
 import json
+from ai_client import create_bedrock_client, has_aws_credentials
 
-load_dotenv()
-
-# Get AWS credentials from environment variables
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
-
-# Create a Bedrock client using boto3
-bedrock = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-)
+# Create a Bedrock client with the shared pool and retry settings
+bedrock = create_bedrock_client()
 
 def generate_ai_response(system_prompt, user_message, model_id="amazon.nova-pro-v1:0"):
     """
     Generate a response from AWS Bedrock GenAI bot using a system prompt.
     """
     try:
-        # For Amazon Titan models, use the converse API with proper message format
+        # Send the system prompt separately so it is never rebuilt with user content
         messages = [
             {
                 "role": "user", 
-                "content": [{"text": f"{system_prompt}\n\nUser: {user_message}"}]
+                "content": [{"text": user_message}]
             }
         ]
         
         response = bedrock.converse(
             modelId=model_id,
+            system=[{"text": system_prompt}],
             messages=messages,
         )
         
@@ -48,7 +35,7 @@ def generate_ai_response(system_prompt, user_message, model_id="amazon.nova-pro-
 # Example usage and test
 if __name__ == "__main__":
     # Check if credentials are available
-    if not AWS_ACCESS_KEY_ID or not AWS_SECRET_ACCESS_KEY:
+    if not has_aws_credentials():
         print("Error: AWS credentials not found. Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY in your .env file")
         exit(1)
     
@@ -1,20 +1,67 @@
+import asyncio
 import enum
-from datetime import datetime
-from typing import List, Optional
-from fastapi import FastAPI, Body, HTTPException
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
+from itertools import islice
+from string import Template
+from typing import AsyncIterator, Final, FrozenSet, Iterator, List, Optional, Tuple
+from fastapi import FastAPI, Body, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import sessionmaker, relationship
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum, create_engine, DateTime
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, contains_eager, sessionmaker, relationship
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum, create_engine, DateTime, func
+from sqlalchemy import event as sa_event
 from sqlalchemy.ext.declarative import declarative_base
-from pydantic import BaseModel
-import os
-from dotenv import load_dotenv
-import boto3
+from sqlalchemy.pool import QueuePool
+from pydantic import BaseModel, TypeAdapter, field_validator
+import orjson
+import aioboto3
+from aiobotocore.config import AioConfig
+from cachetools import TTLCache, cached
+from ai_client import BEDROCK_CLIENT_OPTIONS, bedrock_client_kwargs, has_aws_credentials
+
+# Async Bedrock client, opened for the lifetime of the app
+bedrock = None
 
-# Load environment variables
-load_dotenv()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the Bedrock client on startup and close it on shutdown."""
+    global bedrock
+    if not has_aws_credentials():
+        yield
+        return
+
+    session = aioboto3.Session()
+    async with session.client(
+        **bedrock_client_kwargs(),
+        config=AioConfig(**BEDROCK_CLIENT_OPTIONS),
+    ) as client:
+        bedrock = client
+        warm_task = None
+        if prompt_meets_cache_minimum(SYSTEM_PROMPT, REPORT_MODEL_ID):
+            warm_task = asyncio.create_task(keep_cache_warm())
+        try:
+            yield
+        finally:
+            if warm_task:
+                # Wait for any in-flight call before the client closes
+                warm_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await warm_task
+            bedrock = None
+
+class UTCORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that writes naive datetimes as UTC with a Z suffix."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z,
+        )
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=UTCORJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -26,23 +73,34 @@ app.add_middleware(
 )
 
 DATABASE_URL = "sqlite:///hsc_app.db"
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
-
-# AWS Bedrock configuration
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+engine = create_engine(
+    DATABASE_URL,
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    connect_args={"check_same_thread": False},
+)
 
-# Create Bedrock client
-bedrock = None
-if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
-    bedrock = boto3.client(
-        service_name="bedrock-runtime",
-        region_name=AWS_REGION,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    )
+@sa_event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so reads don't block on writes, and relax fsyncs to one per commit."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+SessionLocal = sessionmaker(bind=engine)
+
+def get_db():
+    """Yield a database session for the duration of a request."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
 
 # Database Models
 Base = declarative_base()
@@ -56,7 +114,7 @@ class Question(Base):
     __tablename__ = 'questions'
     
     question_id = Column(Integer, primary_key=True)
-    topic = Column(String, nullable=False)
+    topic = Column(String, nullable=False, index=True)
     question_img = Column(String, nullable=False)
     answer_img = Column(String, nullable=False)
 
@@ -66,171 +124,54 @@ class Attempt(Base):
     __tablename__ = 'attempts'
     
     id = Column(Integer, primary_key=True)
-    question_id = Column(Integer, ForeignKey('questions.question_id'))
+    question_id = Column(Integer, ForeignKey('questions.question_id'), index=True)
     error_type = Column(Enum(ErrorType), nullable=True)
     explanation = Column(Text, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    # Python default keeps microseconds and covers tables created before the
+    # server default existed; the server default covers inserts outside the ORM
+    timestamp = Column(DateTime, default=lambda: datetime.now(timezone.utc), server_default=func.now())
 
     question = relationship('Question', back_populates='attempts')
 
 # Pydantic Models for API
+class AttemptQuestion(BaseModel):
+    topic: str
+    question_id: int
+
+    class Config:
+        from_attributes = True
+
 class AttemptResponse(BaseModel):
     id: int
     question_id: int
-    error_type: Optional[str]
+    error_type: Optional[ErrorType]
     explanation: Optional[str]
-    timestamp: str
-    question: dict
+    timestamp: datetime
+    question: AttemptQuestion
 
     class Config:
         from_attributes = True
 
+    @field_validator('timestamp', mode='before')
+    @classmethod
+    def default_timestamp(cls, value):
+        return value or datetime.now(timezone.utc)
+
+# Validates and serialises whole attempt lists in pydantic-core
+attempt_list_adapter = TypeAdapter(List[AttemptResponse])
+
 class ReportRequest(BaseModel):
     attempts: List[dict]
 
+class BatchReportRequest(BaseModel):
+    requests: List[ReportRequest]
+
 class ReportResponse(BaseModel):
     report: str
 
-# AI Report Generation Function
-def generate_ai_response(system_prompt: str, user_message: str, model_id: str = "amazon.nova-pro-v1:0") -> Optional[str]:
-    """Generate a response from AWS Bedrock GenAI bot using a system prompt."""
-    if not bedrock:
-        return None
-        
-    try:
-        messages = [
-            {
-                "role": "user", 
-                "content": [{"text": f"{system_prompt}\n\nUser: {user_message}"}]
-            }
-        ]
-        
-        response = bedrock.converse(
-            modelId=model_id,
-            messages=messages,
-        )
-        
-        response_text = response['output']['message']['content'][0]['text']
-        return response_text
-        
-    except Exception as e:
-        print(f"Error generating AI response: {e}")
-        return None
-
-def format_attempts_for_ai(attempts: List[dict]) -> str:
-    """Format attempts data for AI analysis."""
-    formatted_attempts = []
-    
-    for attempt in attempts:
-        if attempt.get('error_type') and attempt['error_type'] != 'none':
-            topic = attempt.get('question', {}).get('topic', 'Unknown')
-            error_type = attempt.get('error_type', 'Unknown')
-            explanation = attempt.get('explanation', 'No explanation provided')
-            question_id = attempt.get('question_id', 'Unknown')
-            
-            formatted_attempts.append(f"""
-Topic - {topic}
-Mistake Type - {error_type}
-Explanation - {explanation}
-Question ID - {question_id}
-""")
-    
-    if not formatted_attempts:
-        return "No mistakes found in the provided attempts. All questions were answered correctly!"
-    
-    return "\n".join(formatted_attempts)
-
-# API Endpoints
-@app.get("/questions_by_topic/{topic}")
-def get_questions_by_topic(topic: str):
-    session = Session()
-    try:
-        questions = session.query(Question).filter(Question.topic == topic).all()
-        if not questions:
-            raise HTTPException(status_code=404, detail="No questions found for this topic")
-        return [
-            {
-                "question_id": q.question_id,
-                "topic": q.topic,
-                "question_img": q.question_img,
-                "answer_img": q.answer_img
-            }
-            for q in questions
-        ]
-    finally:
-        session.close()
-
-@app.post("/attempt")
-def create_attempt(
-    question_id: int = Body(...),
-    error_type: str = Body(None),
-    explanation: str = Body(None)
-):
-    session = Session()
-    try:
-        # Validate question exists
-        question = session.query(Question).filter(Question.question_id == question_id).first()
-        if not question:
-            raise HTTPException(status_code=404, detail="Question not found")
-        
-        # Validate error_type
-        error_enum = None
-        if error_type:
-            try:
-                error_enum = ErrorType(error_type)
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid error_type")
-        
-        attempt = Attempt(
-            question_id=question_id,
-            error_type=error_enum,
-            explanation=explanation
-        )
-        session.add(attempt)
-        session.commit()
-        
-        return {"message": "Attempt created successfully", "id": attempt.id}
-    finally:
-        session.close()
-
-@app.get("/topics")
-def get_topics():
-    session = Session()
-    try:
-        topics = session.query(Question.topic).distinct().all()
-        return [t[0] for t in topics]
-    finally:
-        session.close()
-
-@app.get("/attempts")
-def get_all_attempts():
-    """Fetch all attempts with their associated question data."""
-    session = Session()
-    try:
-        attempts = session.query(Attempt).join(Question).all()
-        
-        return [
-            {
-                "id": attempt.id,
-                "question_id": attempt.question_id,
-                "error_type": attempt.error_type.value if attempt.error_type else None,
-                "explanation": attempt.explanation,
-                "timestamp": attempt.timestamp.isoformat() + "Z" if attempt.timestamp else datetime.utcnow().isoformat() + "Z",
-                "question": {
-                    "topic": attempt.question.topic,
-                    "question_id": attempt.question.question_id
-                }
-            }
-            for attempt in attempts
-        ]
-    finally:
-        session.close()
-
-@app.post("/generate-report")
-def generate_report(request: ReportRequest):
-    """Generate an AI-powered study report based on attempt data."""
-    
-    system_prompt = """
+# AI report prompt. Kept at module level so the exact bytes are identical on
+# every call, which Bedrock needs to serve the prefix from its prompt cache.
+SYSTEM_PROMPT: Final[str] = """
 You are an experienced mathematics tutor. Your role is to help students learn from their mistakes by analyzing their incorrect responses and providing targeted feedback.
 Please have a maximum of 250 words
 ## Your Task
@@ -300,22 +241,274 @@ Based on your recent practice sessions, you're showing strong mathematical reaso
 Remember: Every mistake is a step toward mastery. Focus on understanding why each error occurred rather than just getting the right answer.
 """
 
-    # Format the attempts data for AI analysis
-    formatted_attempts = format_attempts_for_ai(request.attempts)
-    
-    # Generate AI report
-    ai_response = None
-    if bedrock:
-        ai_response = generate_ai_response(system_prompt, formatted_attempts)
+# Bedrock model used for study reports
+REPORT_MODEL_ID = "amazon.nova-pro-v1:0"
+
+# Bedrock keeps cached prompt prefixes for 5 minutes, so re-prime just inside that
+CACHE_WARM_INTERVAL_SECONDS = 240
+
+# Models that accept a cachePoint block in the Converse system prompt, mapped
+# to the documented minimum number of tokens a cache checkpoint must cover
+CACHE_SUPPORTED_MODELS = {
+    "amazon.nova-micro-v1:0": 1000,
+    "amazon.nova-lite-v1:0": 1000,
+    "amazon.nova-pro-v1:0": 1000,
+    "anthropic.claude-3-5-haiku-20241022-v1:0": 2048,
+    "anthropic.claude-3-5-sonnet-20241022-v2:0": 1024,
+    "anthropic.claude-3-7-sonnet-20250219-v1:0": 1024,
+}
+
+# Cap on concurrent Bedrock calls per worker, to stay within account quotas
+BEDROCK_MAX_CONCURRENCY = 8
+bedrock_semaphore = asyncio.Semaphore(BEDROCK_MAX_CONCURRENCY)
+
+def build_system_blocks(system_prompt: str, model_id: str) -> List[dict]:
+    """Build the Converse system blocks, adding a cache point where the model supports it."""
+    system = [{"text": system_prompt}]
+    if model_id in CACHE_SUPPORTED_MODELS:
+        system.append({"cachePoint": {"type": "default"}})
+    return system
+
+def prompt_meets_cache_minimum(system_prompt: str, model_id: str) -> bool:
+    """Return True if the prompt is likely long enough for Bedrock to cache for this model."""
+    if model_id not in CACHE_SUPPORTED_MODELS:
+        return False
+    # Rough estimate of ~4 characters per token for English text
+    return len(system_prompt) // 4 >= CACHE_SUPPORTED_MODELS[model_id]
+
+def log_bedrock_usage(usage: dict) -> None:
+    """Log token usage, including prompt cache reads and writes, for a Bedrock call."""
+    print(
+        f"Bedrock usage: input={usage.get('inputTokens', 0)} "
+        f"output={usage.get('outputTokens', 0)} "
+        f"cache_read={usage.get('cacheReadInputTokens', 0)} "
+        f"cache_write={usage.get('cacheWriteInputTokens', 0)}"
+    )
+
+async def keep_cache_warm() -> None:
+    """Periodically send a minimal request so the system prompt stays in Bedrock's cache."""
+    while True:
+        await asyncio.sleep(CACHE_WARM_INTERVAL_SECONDS)
+        try:
+            async with bedrock_semaphore:
+                response = await bedrock.converse(
+                    modelId=REPORT_MODEL_ID,
+                    system=build_system_blocks(SYSTEM_PROMPT, REPORT_MODEL_ID),
+                    messages=[{"role": "user", "content": [{"text": "ping"}]}],
+                    inferenceConfig={"maxTokens": 1},
+                )
+        except Exception as e:
+            print(f"Error warming prompt cache: {e}")
+            continue
+        
+        usage = response.get('usage', {})
+        log_bedrock_usage(usage)
+        if not (usage.get('cacheReadInputTokens') or usage.get('cacheWriteInputTokens')):
+            print("Bedrock did not cache the system prompt; stopping cache warming.")
+            return
+
+# AI Report Generation Function
+async def generate_ai_response(system_prompt: str, user_message: str, model_id: str = REPORT_MODEL_ID) -> Optional[str]:
+    """Generate a response from AWS Bedrock GenAI bot using a system prompt."""
+    if not bedrock:
+        return None
+        
+    try:
+        messages = [
+            {
+                "role": "user", 
+                "content": [{"text": user_message}]
+            }
+        ]
+        
+        async with bedrock_semaphore:
+            response = await bedrock.converse(
+                modelId=model_id,
+                system=build_system_blocks(system_prompt, model_id),
+                messages=messages,
+            )
+        
+        log_bedrock_usage(response.get('usage', {}))
+        
+        response_text = response['output']['message']['content'][0]['text']
+        return response_text
+        
+    except Exception as e:
+        print(f"Error generating AI response: {e}")
+        return None
+
+async def stream_ai_response(system_prompt: str, user_message: str, model_id: str = REPORT_MODEL_ID) -> AsyncIterator[str]:
+    """Stream response text from AWS Bedrock GenAI bot as it is generated."""
+    messages = [
+        {
+            "role": "user",
+            "content": [{"text": user_message}]
+        }
+    ]
     
-    # Fallback response if AI is not available or fails
-    if not ai_response:
-        # Count mistake types for fallback report
-        silly_mistakes = sum(1 for attempt in request.attempts if attempt.get('error_type') == 'silly')
-        concept_errors = sum(1 for attempt in request.attempts if attempt.get('error_type') == 'concept')
+    async with bedrock_semaphore:
+        response = await bedrock.converse_stream(
+            modelId=model_id,
+            system=build_system_blocks(system_prompt, model_id),
+            messages=messages,
+        )
         
-        ai_response = f"""**Overall Summary:**
-Based on your recent practice sessions, you completed {len(request.attempts)} questions. You made {silly_mistakes} silly mistakes and {concept_errors} concept errors.
+        async for event in response['stream']:
+            if 'contentBlockDelta' in event:
+                text = event['contentBlockDelta']['delta'].get('text')
+                if text:
+                    yield text
+            elif 'metadata' in event:
+                log_bedrock_usage(event['metadata'].get('usage', {}))
+
+# One mistake entry in the AI prompt
+MISTAKE_TEMPLATE = """
+Topic - {topic}
+Mistake Type - {error_type}
+Explanation - {explanation}
+Question ID - {question_id}
+"""
+
+# Cap on example mistakes sent to the model; the summary covers the rest
+MAX_PROMPT_MISTAKES = 30
+
+def iter_mistakes(attempts: List[dict]) -> Iterator[dict]:
+    """Yield the attempts that recorded a mistake."""
+    return (
+        attempt for attempt in attempts
+        if attempt.get('error_type') and attempt['error_type'] != 'none'
+    )
+
+def count_mistakes(attempts: List[dict]) -> Counter:
+    """Count mistakes by (topic, error_type)."""
+    return Counter(
+        (attempt.get('question', {}).get('topic', 'Unknown'), attempt['error_type'])
+        for attempt in iter_mistakes(attempts)
+    )
+
+def iter_unique_mistakes(attempts: List[dict]) -> Iterator[dict]:
+    """Yield mistakes, skipping repeats of the same topic, type and explanation."""
+    seen = set()
+    for attempt in iter_mistakes(attempts):
+        key = (
+            attempt.get('question', {}).get('topic', 'Unknown'),
+            attempt['error_type'],
+            str(attempt.get('explanation') or '')[:80],
+        )
+        if key not in seen:
+            seen.add(key)
+            yield attempt
+
+def format_attempts_for_ai(attempts: List[dict]) -> str:
+    """Format attempts data for AI analysis."""
+    counts = count_mistakes(attempts)
+    if not counts:
+        return "No mistakes found in the provided attempts. All questions were answered correctly!"
+    
+    # Summarise the full distribution so the model still sees every mistake
+    # even though only a capped set of distinct examples is listed
+    summary = f"Mistake summary ({sum(counts.values())} total):\n" + "\n".join(
+        f"- {topic} - {error_type}: {count}"
+        for (topic, error_type), count in sorted(counts.items(), key=lambda kv: (str(kv[0][0]), str(kv[0][1])))
+    )
+    examples = "\n".join(
+        MISTAKE_TEMPLATE.format(
+            topic=attempt.get('question', {}).get('topic', 'Unknown'),
+            error_type=attempt.get('error_type', 'Unknown'),
+            explanation=attempt.get('explanation', 'No explanation provided'),
+            question_id=attempt.get('question_id', 'Unknown'),
+        )
+        for attempt in islice(iter_unique_mistakes(attempts), MAX_PROMPT_MISTAKES)
+    )
+    
+    return f"{summary}\n{examples}"
+
+# API Endpoints
+@app.get("/questions_by_topic/{topic}")
+def get_questions_by_topic(topic: str, db: Session = Depends(get_db)):
+    questions = db.query(Question).filter(Question.topic == topic).all()
+    if not questions:
+        raise HTTPException(status_code=404, detail="No questions found for this topic")
+    return [
+        {
+            "question_id": q.question_id,
+            "topic": q.topic,
+            "question_img": q.question_img,
+            "answer_img": q.answer_img
+        }
+        for q in questions
+    ]
+
+@app.post("/attempt")
+def create_attempt(
+    question_id: int = Body(...),
+    error_type: str = Body(None),
+    explanation: str = Body(None),
+    db: Session = Depends(get_db)
+):
+    # Validate question exists
+    question = db.query(Question).filter(Question.question_id == question_id).first()
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+    
+    # Validate error_type
+    error_enum = None
+    if error_type:
+        try:
+            error_enum = ErrorType(error_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid error_type")
+    
+    attempt = Attempt(
+        question_id=question_id,
+        error_type=error_enum,
+        explanation=explanation
+    )
+    db.add(attempt)
+    db.commit()
+    
+    return {"message": "Attempt created successfully", "id": attempt.id}
+
+# The question bank rarely changes, so topics are reloaded at most once per TTL.
+# Anything that adds questions should call topics_cache.clear().
+TOPICS_CACHE_TTL_SECONDS = 60
+topics_cache = TTLCache(maxsize=1, ttl=TOPICS_CACHE_TTL_SECONDS)
+
+# get_topics is sync, so FastAPI may call this from several threadpool threads at once
+@cached(cache=topics_cache, key=lambda: "topics", lock=threading.Lock())
+def load_topics() -> List[str]:
+    """Load the distinct question topics from the database."""
+    with SessionLocal() as db:
+        topics = db.query(Question.topic).distinct().all()
+        return [t[0] for t in topics]
+
+@app.get("/topics")
+def get_topics():
+    return load_topics()
+
+@app.get("/attempts")
+def get_all_attempts(db: Session = Depends(get_db)):
+    """Fetch all attempts with their associated question data."""
+    # Populate attempt.question from the join itself so reading it below
+    # doesn't lazy-load one question per attempt
+    attempts = (
+        db.query(Attempt)
+        .join(Attempt.question)
+        .options(contains_eager(Attempt.question))
+        .all()
+    )
+    
+    # Hand datetimes and enums straight to orjson rather than through
+    # FastAPI's jsonable_encoder, which would drop the UTC suffix
+    return UTCORJSONResponse(
+        attempt_list_adapter.dump_python(
+            attempt_list_adapter.validate_python(attempts, from_attributes=True)
+        )
+    )
+
+# Basic report used when AI is not available or fails
+FALLBACK_REPORT_TEMPLATE = Template("""**Overall Summary:**
+Based on your recent practice sessions, you completed $total questions. You made $silly silly mistakes and $concept concept errors.
 
 **Key Areas for Improvement:**
 - Focus on double-checking your work to avoid silly mistakes
@@ -330,17 +523,131 @@ Based on your recent practice sessions, you completed {len(request.attempts)} qu
 
 Remember: Every mistake is a learning opportunity. Keep practicing and you'll continue to improve!
 
-*Note: This is a basic report. For detailed AI analysis, please check your AWS Bedrock configuration.*"""
+*Note: This is a basic report. For detailed AI analysis, please check your AWS Bedrock configuration.*""")
+
+def build_fallback_report(attempts: List[dict]) -> str:
+    """Build a basic report from mistake counts when AI is unavailable."""
+    # Count mistake types for fallback report in a single pass
+    counts = Counter(attempt.get('error_type') for attempt in attempts)
+    
+    return FALLBACK_REPORT_TEMPLATE.substitute(
+        total=len(attempts),
+        silly=counts.get('silly', 0),
+        concept=counts.get('concept', 0),
+    )
+
+# Reports for students with the same mistake profile are near-identical, so
+# AI responses are reused for an hour. Cache access never awaits, so the
+# event loop already serialises it and no lock is needed.
+report_cache = TTLCache(maxsize=512, ttl=3600)
+
+def report_cache_key(attempts: List[dict]) -> FrozenSet:
+    """Fingerprint attempts by their (topic, error_type) counts, ignoring free text and IDs."""
+    # A frozenset is order-free, so topics mixing None and str never need comparing
+    return frozenset(count_mistakes(attempts).items())
+
+async def build_report(attempts: List[dict]) -> Tuple[str, bool]:
+    """Generate a study report for one set of attempts, falling back to a basic report.
+
+    Returns the report and whether it was served from the report cache.
+    """
+    cache_key = report_cache_key(attempts)
+    cached_report = report_cache.get(cache_key)
+    if cached_report is not None:
+        return cached_report, True
+    
+    # Format the attempts data for AI analysis
+    formatted_attempts = format_attempts_for_ai(attempts)
+    
+    # Generate AI report
+    ai_response = None
+    if bedrock:
+        ai_response = await generate_ai_response(SYSTEM_PROMPT, formatted_attempts)
+    
+    # Fallback response if AI is not available or fails
+    if not ai_response:
+        return build_fallback_report(attempts), False
+    
+    report_cache[cache_key] = ai_response
+    return ai_response, False
+
+@app.post("/generate-report", response_class=UTCORJSONResponse)
+async def generate_report(request: ReportRequest):
+    """Generate an AI-powered study report based on attempt data."""
+    ai_response, cache_hit = await build_report(request.attempts)
+    # The report is already a plain string, so skip model validation and
+    # jsonable_encoder and hand it straight to orjson
+    return UTCORJSONResponse(
+        {"report": ai_response},
+        headers={"X-Cache": "HIT" if cache_hit else "MISS"},
+    )
+
+def format_sse(text: str, event: Optional[str] = None) -> str:
+    """Format text as one server-sent event, splitting newlines across data lines."""
+    prefix = f"event: {event}\n" if event else ""
+    return prefix + "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
 
-    return ReportResponse(report=ai_response)
+@app.post("/generate-report/stream")
+async def generate_report_stream(request: ReportRequest):
+    """Stream an AI-powered study report as server-sent events."""
+    
+    async def event_gen():
+        cache_key = report_cache_key(request.attempts)
+        cached_report = report_cache.get(cache_key)
+        if cached_report is not None:
+            yield format_sse(cached_report)
+        elif bedrock:
+            chunks = []
+            try:
+                async for text in stream_ai_response(SYSTEM_PROMPT, format_attempts_for_ai(request.attempts)):
+                    chunks.append(text)
+                    yield format_sse(text)
+                # Only cache reports that streamed to completion
+                if chunks:
+                    report_cache[cache_key] = "".join(chunks)
+            except Exception as e:
+                print(f"Error streaming AI response: {e}")
+                # Tell the client the text it already has is a partial report
+                if chunks:
+                    yield format_sse("Report generation was interrupted; the report is incomplete.", event="error")
+            
+            if not chunks:
+                yield format_sse(build_fallback_report(request.attempts))
+        else:
+            yield format_sse(build_fallback_report(request.attempts))
+        
+        yield format_sse("[DONE]")
+    
+    return StreamingResponse(event_gen(), media_type="text/event-stream")
+
+@app.post("/generate-reports-batch")
+async def generate_reports_batch(request: BatchReportRequest) -> List[ReportResponse]:
+    """Generate study reports for several attempt sets concurrently."""
+    results = await asyncio.gather(
+        *(build_report(r.attempts) for r in request.requests),
+        return_exceptions=True,
+    )
+    
+    reports = []
+    for r, result in zip(request.requests, results):
+        if isinstance(result, Exception):
+            print(f"Error generating batch report: {result}")
+            reports.append(ReportResponse(report=build_fallback_report(r.attempts)))
+        else:
+            reports.append(ReportResponse(report=result[0]))
+    return reports
 
 # Database initialization
 if __name__ == "__main__":
     Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, so add any missing indexes
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     print("Database and tables created.")
 
     # Add sample questions if not present
-    session = Session()
+    session = SessionLocal()
     try:
         # Check if we have any questions
         existing_questions = session.query(Question).count()